@@ -9,17 +9,11 @@ cameras_df = polars.read_excel("cameras.xlsx")
 
 # df Columns: Nome, Usuário, Senha, IP, Marca (assuming brand column exists)
 # If brand column doesn't exist, default to HIKVISION format
+if "Marca" not in cameras_df.columns:
+    cameras_df = cameras_df.with_columns(polars.lit("HIKVISION").alias("Marca"))
 
 CAMERAS_MAPPING = {}
-for obj in cameras_df.to_dicts():
-    camera_name = obj["Nome"]
-    username = obj["Usuário"]
-    password = obj["Senha"]
-    ip = obj["IP"]
-
-    # Check if brand column exists, otherwise default to HIKVISION
-    brand = obj.get("Marca", "HIKVISION")
-
+for camera_name, username, password, ip, brand in cameras_df.select("Nome", "Usuário", "Senha", "IP", "Marca").iter_rows():
     try:
         rtsp_url = construct_rtsp_url(brand, username, password, ip)
         CAMERAS_MAPPING[camera_name] = rtsp_url
@@ -29,4 +23,7 @@ for obj in cameras_df.to_dicts():
         rtsp_url = construct_rtsp_url("HIKVISION", username, password, ip)
         CAMERAS_MAPPING[camera_name] = rtsp_url
 
-print(CAMERAS_MAPPING)
+# Frozen views of the camera names for hot-path iteration and membership checks
+CAMERA_NAMES = tuple(CAMERAS_MAPPING)
+CAMERA_NAMES_SET = frozenset(CAMERA_NAMES)
+FIRST_CAMERA = CAMERA_NAMES[0] if CAMERA_NAMES else None
@@ -1,3 +1,4 @@
 import pathlib
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+STATIC_DIR = BASE_DIR / "static"
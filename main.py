@@ -1,23 +1,49 @@
 import asyncio
+import functools
+import hashlib
 import signal
 import socket
 import sys
+from contextlib import asynccontextmanager
 
 import cv2
 import numpy as np
 import qrcode
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
 
-from constants.camera import CAMERAS_MAPPING
-from utils.camera_stream_manager import stream_manager
-from utils.config import CAMERA_CONFIG
+from constants.camera import CAMERA_NAMES, CAMERA_NAMES_SET, CAMERAS_MAPPING, FIRST_CAMERA
+from constants.paths import STATIC_DIR
+from utils.camera_stream_manager import CameraStream, stream_manager
+from utils.config import CAMERA_CONFIG, PERFORMANCE_CONFIG
 from utils.construct_rtsp_url import is_webcam
 from utils.status_endpoint import create_status_router
 
-app = FastAPI(title="Local Camera Viewer", version="2.0.0")
+
+# Initialize camera streams on startup, cleanup on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize all camera streams on startup and clean them up on shutdown."""
+    print("🚀 Initializing camera streams...")
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(stream_manager.add_camera, camera_name, rtsp_url)
+            for camera_name, rtsp_url in CAMERAS_MAPPING.items()
+        )
+    )
+    build_page_cache()
+    print(f"✅ Initialized {len(CAMERAS_MAPPING)} camera streams")
+
+    yield
+
+    print("🛑 Shutting down camera streams...")
+    await asyncio.to_thread(stream_manager.stop_all)
+
+
+app = FastAPI(title="Local Camera Viewer", version="2.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -31,33 +57,21 @@ app.add_middleware(
 # Add status router
 app.include_router(create_status_router())
 
+# Shared stylesheet for the HTML pages
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Cache black frame JPEG to avoid re-encoding
-def get_cached_black_jpeg():
-    """Get cached black frame JPEG to avoid re-encoding."""
-    if not hasattr(get_cached_black_jpeg, "_cached"):
-        black_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        _, buffer = cv2.imencode(".jpg", black_frame, [cv2.IMWRITE_JPEG_QUALITY, CAMERA_CONFIG["jpeg_quality"]])
-        get_cached_black_jpeg._cached = buffer.tobytes()
-    return get_cached_black_jpeg._cached
 
+# Rendered HTML pages (UTF-8 body + headers), built once on startup (camera list is fixed)
+INDEX_PAGE_KEY = "__index__"
+PAGE_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+_PAGE_CACHE: dict[str, tuple[bytes, dict[str, str]]] = {}
 
-# Initialize camera streams on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize all camera streams on startup."""
-    print("🚀 Initializing camera streams...")
-    for camera_name, rtsp_url in CAMERAS_MAPPING.items():
-        stream_manager.add_camera(camera_name, rtsp_url)
-    print(f"✅ Initialized {len(CAMERAS_MAPPING)} camera streams")
 
-
-# Cleanup on shutdown
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup camera streams on shutdown."""
-    print("🛑 Shutting down camera streams...")
-    stream_manager.stop_all()
+# Black frame sent while a camera has no data yet, encoded once at import
+_BLACK_JPEG = cv2.imencode(
+    ".jpg", np.zeros((480, 640, 3), dtype=np.uint8), [cv2.IMWRITE_JPEG_QUALITY, CAMERA_CONFIG["jpeg_quality"]]
+)[1].tobytes()
+_BLACK_CHUNK = b"".join((CameraStream.HEAD, _BLACK_JPEG, CameraStream.TAIL))
 
 
 # Signal handlers for graceful shutdown
@@ -75,74 +89,27 @@ signal.signal(signal.SIGTERM, signal_handler)
 def render_tabs(selected=None):
     """Generate navigation tabs for all cameras."""
     tabs = ""
-    for name in CAMERAS_MAPPING.keys():
+    for name in CAMERA_NAMES:
         active = "active-tab" if name == selected else ""
         tabs += f"<a href='/camera/{name}' class='tab {active}'>{name}</a>"
     return tabs
 
 
-@app.get("/", response_class=HTMLResponse)
-def index():
-    """Main page with camera selection - redirects to first camera."""
-    # Redirect to first camera if available
-    if CAMERAS_MAPPING:
-        first_camera = list(CAMERAS_MAPPING.keys())[0]
-        from fastapi.responses import RedirectResponse
+# Tab strip for every possible selection (None = no camera selected)
+_TABS_BY_SELECTED: dict[str | None, str] = {None: render_tabs()}
+_TABS_BY_SELECTED.update((name, render_tabs(name)) for name in CAMERA_NAMES)
 
-        return RedirectResponse(url=f"/camera/{first_camera}")
 
-    # Fallback to camera selection if no cameras
-    tabs = render_tabs()
+def render_index_page(tabs: str) -> str:
+    """Render the camera selection page."""
     return f"""
     <html>
     <head>
         <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
         <title>Visualização de Câmeras v2.0</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; background: #f4f4f4; margin: 0; }}
-            .header {{ text-align: center; padding: 1rem 0.5rem; background: #222; color: #fff; }}
-            .header h1 {{ font-size: 1.5rem; margin: 0 0 0.5rem 0; }}
-            .header p {{ font-size: 0.9rem; margin: 0; opacity: 0.9; }}
-            .tabs {{ display: flex; justify-content: center; background: #333; padding: 0.5rem; flex-wrap: wrap; gap: 0.3rem; }}
-            .tab {{ color: #fff; text-decoration: none; padding: 0.8rem 1.2rem; border-radius: 8px; background: #444; transition: background 0.2s; font-size: 0.9rem; white-space: nowrap; }}
-            .tab:hover {{ background: #666; }}
-            .active-tab {{ background: #fff; color: #222; font-weight: bold; }}
-            .main-content {{ display: flex; flex-direction: column; align-items: center; margin-top: 2rem; padding: 0 1rem; }}
-            .info {{ margin-top: 1.5rem; color: #555; text-align: center; }}
-            .status-bar {{ background: #fff; padding: 1rem; border-radius: 8px; margin-top: 1.5rem; box-shadow: 0 2px 8px #0001; width: 100%; max-width: 500px; }}
-            .status-item {{ margin: 0.5rem 0; }}
-            .status-item a {{ color: #007bff; text-decoration: none; }}
-            .status-item a:hover {{ text-decoration: underline; }}
-            
-            .features-info {{ background: #fff; padding: 1.5rem; border-radius: 8px; margin-top: 1.5rem; box-shadow: 0 2px 8px #0001; width: 100%; max-width: 600px; }}
-            .features-info h3 {{ margin: 0 0 1rem 0; color: #333; text-align: center; }}
-            .feature-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 1rem; }}
-            .feature-item {{ display: flex; flex-direction: column; align-items: center; text-align: center; padding: 1rem; background: #f8f9fa; border-radius: 8px; }}
-            .feature-icon {{ font-size: 2rem; margin-bottom: 0.5rem; }}
-            .feature-text {{ font-size: 0.9rem; color: #555; font-weight: 500; }}
-            
-            /* Mobile optimizations */
-            @media (max-width: 768px) {{
-                .header {{ padding: 1rem 0.3rem; }}
-                .header h1 {{ font-size: 1.3rem; }}
-                .header p {{ font-size: 0.8rem; }}
-                .tabs {{ padding: 0.3rem; gap: 0.2rem; }}
-                .tab {{ padding: 0.6rem 1rem; font-size: 0.8rem; }}
-                .main-content {{ margin-top: 1.5rem; padding: 0 0.5rem; }}
-                .status-bar {{ margin-top: 1rem; padding: 0.8rem; }}
-            }}
-            
-            @media (max-width: 480px) {{
-                .header h1 {{ font-size: 1.2rem; }}
-                .header p {{ font-size: 0.75rem; }}
-                .tabs {{ flex-direction: column; align-items: center; }}
-                .tab {{ width: 100%; text-align: center; max-width: 200px; }}
-                .main-content {{ margin-top: 1rem; }}
-                .status-bar {{ padding: 0.6rem; }}
-            }}
-        </style>
+        <link rel="stylesheet" href="/static/app.css">
     </head>
-    <body>
+    <body class='index-page'>
         <div class='header'>
             <h1>Visualização de Câmeras v2.0</h1>
             <p>Servidor Intermediário com Suporte a Múltiplos Clientes</p>
@@ -185,74 +152,16 @@ def index():
     """
 
 
-@app.get("/camera/{camera_name}", response_class=HTMLResponse)
-def camera_page(camera_name: str):
-    """Individual camera page."""
-    if camera_name not in CAMERAS_MAPPING:
-        raise HTTPException(status_code=404, detail="Câmera não encontrada")
-
-    tabs = render_tabs(selected=camera_name)
+def render_camera_page(camera_name: str, tabs: str) -> str:
+    """Render the page for a single camera."""
     return f"""
     <html>
     <head>
         <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
         <title>Câmera: {camera_name}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; background: #f4f4f4; margin: 0; }}
-            .header {{ text-align: center; padding: 1rem 0.5rem; background: #222; color: #fff; }}
-            .header h1 {{ font-size: 1.5rem; margin: 0 0 0.5rem 0; }}
-            .tabs {{ display: flex; justify-content: center; background: #333; padding: 0.5rem; flex-wrap: wrap; gap: 0.3rem; }}
-            .tab {{ color: #fff; text-decoration: none; padding: 0.8rem 1.2rem; border-radius: 8px; background: #444; transition: background 0.2s; font-size: 0.9rem; white-space: nowrap; }}
-            .tab:hover {{ background: #666; }}
-            .active-tab {{ background: #fff; color: #222; font-weight: bold; }}
-            .main-content {{ display: flex; flex-direction: column; align-items: center; margin-top: 1.5rem; padding: 0 1rem; }}
-            .camera-title {{ font-size: 1.8rem; margin-bottom: 1.2rem; color: #222; text-align: center; }}
-            .camera-img-wrapper {{ background: #fff; padding: 1rem; border-radius: 16px; box-shadow: 0 2px 16px #0001; display: flex; flex-direction: column; align-items: center; width: 100%; max-width: 95vw; }}
-            .camera-img {{ width: 100%; height: auto; max-height: 60vh; border-radius: 8px; box-shadow: 0 1px 8px #0002; object-fit: contain; }}
-            .camera-controls {{ display: flex; flex-direction: column; gap: 1rem; align-items: center; margin-top: 1.5rem; width: 100%; }}
-            .back-link, .status-link {{ color: #333; text-decoration: none; font-size: 1rem; padding: 0.8rem 1.5rem; background: #fff; border-radius: 8px; box-shadow: 0 2px 8px #0001; text-align: center; min-width: 200px; }}
-            .back-link:hover, .status-link:hover {{ text-decoration: underline; background: #f8f8f8; }}
-            .status-link {{ background: #007bff; color: #fff; }}
-            .status-link:hover {{ background: #0056b3; }}
-            .status-info {{ background: #e8f5e8; padding: 1rem; border-radius: 8px; margin-top: 1rem; border-left: 4px solid #4caf50; width: 100%; text-align: center; font-size: 0.9rem; line-height: 1.4; }}
-            
-            /* Mobile optimizations */
-            @media (max-width: 768px) {{
-                .header {{ padding: 1rem 0.3rem; }}
-                .header h1 {{ font-size: 1.3rem; }}
-                .tabs {{ padding: 0.3rem; gap: 0.2rem; }}
-                .tab {{ padding: 0.6rem 1rem; font-size: 0.8rem; }}
-                .main-content {{ margin-top: 1rem; padding: 0 0.5rem; }}
-                .camera-title {{ font-size: 1.5rem; margin-bottom: 1rem; }}
-                .camera-img-wrapper {{ padding: 0.8rem; }}
-                .camera-img {{ max-height: 50vh; }}
-                .status-info {{ font-size: 0.8rem; padding: 0.8rem; }}
-                .camera-controls {{ margin-top: 1.2rem; }}
-                .back-link, .status-link {{ padding: 0.6rem 1.2rem; font-size: 0.9rem; min-width: 180px; }}
-            }}
-            
-            @media (max-width: 480px) {{
-                .header h1 {{ font-size: 1.2rem; }}
-                .tabs {{ flex-direction: column; align-items: center; }}
-                .tab {{ width: 100%; text-align: center; max-width: 200px; }}
-                .main-content {{ margin-top: 0.8rem; }}
-                .camera-title {{ font-size: 1.3rem; }}
-                .camera-img-wrapper {{ padding: 0.6rem; }}
-                .camera-img {{ max-height: 45vh; }}
-                .status-info {{ font-size: 0.75rem; padding: 0.6rem; }}
-                .camera-controls {{ margin-top: 1rem; }}
-                .back-link, .status-link {{ padding: 0.5rem 1rem; font-size: 0.85rem; min-width: 160px; }}
-            }}
-            
-            /* Landscape orientation for mobile */
-            @media (max-width: 768px) and (orientation: landscape) {{
-                .camera-img {{ max-height: 70vh; }}
-                .header h1 {{ font-size: 1.2rem; }}
-                .camera-title {{ font-size: 1.4rem; }}
-            }}
-        </style>
+        <link rel="stylesheet" href="/static/app.css">
     </head>
-    <body>
+    <body class='camera-page'>
         <div class='header'>
             <h1>Visualização de Câmeras v2.0</h1>
         </div>
@@ -273,49 +182,94 @@ def camera_page(camera_name: str):
     """
 
 
+def cache_page(key: str, html: str):
+    """Store a rendered page as UTF-8 bytes together with its ETag."""
+    page = html.encode("utf-8")
+    # Not a security use: FIPS-mode OpenSSL builds reject md5() unless told so
+    etag = f'"{hashlib.md5(page, usedforsecurity=False).hexdigest()}"'
+    _PAGE_CACHE[key] = (page, {**PAGE_CACHE_HEADERS, "ETag": etag})
+
+
+def build_page_cache():
+    """Render every HTML page once, since the camera list is fixed at startup."""
+    cache_page(INDEX_PAGE_KEY, render_index_page(_TABS_BY_SELECTED[None]))
+    for camera_name in CAMERA_NAMES:
+        cache_page(camera_name, render_camera_page(camera_name, _TABS_BY_SELECTED[camera_name]))
+
+
+def cached_page_response(request: Request, key: str) -> Response:
+    """Serve a cached page, answering conditional GETs with 304 Not Modified."""
+    page, headers = _PAGE_CACHE[key]
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=page, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@app.get("/", response_class=HTMLResponse)
+def index(request: Request):
+    """Main page with camera selection - redirects to first camera."""
+    # Redirect to first camera if available
+    if FIRST_CAMERA is not None:
+        return RedirectResponse(url=f"/camera/{FIRST_CAMERA}", status_code=307)
+
+    # Fallback to camera selection if no cameras
+    return cached_page_response(request, INDEX_PAGE_KEY)
+
+
+@app.get("/camera/{camera_name}", response_class=HTMLResponse)
+def camera_page(request: Request, camera_name: str):
+    """Individual camera page."""
+    if camera_name not in CAMERA_NAMES_SET:
+        raise HTTPException(status_code=404, detail="Câmera não encontrada")
+
+    return cached_page_response(request, camera_name)
+
+
 async def gen_frames_async(camera_name: str):
     """Generate frames asynchronously for a specific camera."""
     camera = stream_manager.get_camera(camera_name)
     if not camera:
         raise HTTPException(status_code=404, detail="Câmera não encontrada")
 
-    # Create a queue for this client
-    client_queue = asyncio.Queue(maxsize=CAMERA_CONFIG["client_queue_size"])
+    # Id of the last frame sent to this client; 0 means none yet, so a client
+    # connecting to a running camera receives the latest frame immediately
+    last_seen_id = 0
 
     try:
         # Add client to camera stream
-        camera.add_client(client_queue)
+        camera.add_client()
         print(f"Client connected to {camera_name}. Total clients: {camera.get_frame_count()}")
 
         while True:
             try:
-                # Wait for frame with timeout
-                frame_data = await asyncio.wait_for(client_queue.get(), timeout=CAMERA_CONFIG["frame_timeout"])
-                yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame_data + b"\r\n")
+                # Wait for a newer frame with timeout; slow clients skip straight to the latest one
+                last_seen_id = await asyncio.wait_for(
+                    camera.wait_for_frame(last_seen_id), timeout=CAMERA_CONFIG["frame_timeout"]
+                )
+                # The stream thread already built the multipart chunk, send it as is
+                yield camera.last_frame_chunk
             except asyncio.TimeoutError:
-                # Send a keep-alive frame using cached JPEG to avoid re-encoding
-                with camera.lock:
-                    cached_jpeg = camera.last_frame_jpeg
-
-                if cached_jpeg is not None:
-                    yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + cached_jpeg + b"\r\n")
+                # Send a keep-alive frame with the chunk the stream thread already built
+                # (attribute read is atomic, no need to block the event loop on the lock)
+                cached_chunk = camera.last_frame_chunk
+                if cached_chunk is not None:
+                    yield cached_chunk
                 else:
                     # Send cached black frame if no camera data
-                    black_frame_jpeg = get_cached_black_jpeg()
-                    yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + black_frame_jpeg + b"\r\n")
+                    yield _BLACK_CHUNK
 
     except asyncio.CancelledError:
         print(f"Client disconnected from {camera_name}")
     finally:
         # Remove client from camera stream
-        camera.remove_client(client_queue)
+        camera.remove_client()
         print(f"Client disconnected from {camera_name}. Total clients: {camera.get_frame_count()}")
 
 
 @app.get("/video_feed/{camera_name}")
 def video_feed(camera_name: str):
     """Video feed endpoint for a specific camera."""
-    if camera_name not in CAMERAS_MAPPING:
+    if camera_name not in CAMERA_NAMES_SET:
         raise HTTPException(status_code=404, detail="Câmera não encontrada")
 
     rtsp_url = CAMERAS_MAPPING[camera_name]
@@ -325,8 +279,9 @@ def video_feed(camera_name: str):
     return StreamingResponse(gen_frames_async(camera_name), media_type="multipart/x-mixed-replace; boundary=frame")
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
-    """Get local IP address for QR code generation."""
+    """Get local IP address for QR code generation (looked up once per run)."""
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
@@ -364,18 +319,22 @@ def generate_qr_code():
     qr_matrix = qr.get_matrix()
 
     # Print QR code in terminal
-    for row in qr_matrix:
-        line = ""
-        for cell in row:
-            line += "██" if cell else "  "
-        print(line)
+    cells = {True: "██", False: "  "}
+    rows = ["".join(map(cells.__getitem__, row)) for row in qr_matrix]
+    sys.stdout.write("\n".join(rows) + "\n")
 
     # Save QR code as JPG file in home directory
     try:
         home_dir = Path.home() / "Desktop"
-        qr_img = qr.make_image(fill_color="black", back_color="white")
         qr_file_path = home_dir / "camera_viewer_qr.jpg"
-        qr_img.save(qr_file_path, "JPEG", quality=95)
+        # Reuse the matrix printed above (black modules on white) instead of a PIL render pass
+        qr_img = np.where(np.asarray(qr_matrix, dtype=bool), 0, 255).astype(np.uint8)
+        qr_img = qr_img.repeat(qr.box_size, axis=0).repeat(qr.box_size, axis=1)
+        # Encode in memory and write with pathlib: cv2.imwrite cannot open non-ASCII paths on Windows
+        ok, qr_jpeg = cv2.imencode(".jpg", qr_img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        if not ok:
+            raise OSError(f"cv2.imencode failed for {qr_file_path}")
+        qr_file_path.write_bytes(qr_jpeg.tobytes())
         print(f"📱 QR Code salvo em: {qr_file_path}")
     except Exception as e:
         print(f"⚠️  Não foi possível salvar o QR Code: {e}")
@@ -401,6 +360,12 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=8000,
-        log_level="info",
+        # uvloop is not available on Windows
+        loop=PERFORMANCE_CONFIG["event_loop"] if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        log_level="warning",  # Skip per-connection info logs from reconnecting clients
+        access_log=False,
+        timeout_keep_alive=120,
+        backlog=512,
         workers=1,  # Important: use only 1 worker with singleton in memory
     )
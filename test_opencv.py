@@ -8,22 +8,27 @@ start = time.time()
 
 # Create an 8 colors 100 random squares
 colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255), (255, 0, 255), (255, 255, 255), (0, 0, 0)]
-list_of_frames = []
-
-# Create 100 frames, each with one random square
-for i in range(100):
-    # Create a new frame for each iteration
-    frame = np.zeros((1000, 1000, 3), dtype=np.uint8)
-    color = random.choice(colors)
-    x = random.randint(0, 900)
-    y = random.randint(0, 900)
-    cv2.rectangle(frame, (x, y), (x + 100, y + 100), color, -1)
-    list_of_frames.append(frame.copy())  # Use .copy() to avoid reference issues
-
-while True:
-    for frame in list_of_frames:
+
+# Pre-paint one 100x100 patch per color and only keep (x, y, color) for each square
+patches = [np.full((100, 100, 3), color, dtype=np.uint8) for color in colors]
+squares = [(random.randint(0, 900), random.randint(0, 900), random.randrange(len(colors))) for _ in range(100)]
+
+# Single frame reused for every square: erase the previous patch, paint the next one
+frame = np.zeros((1000, 1000, 3), dtype=np.uint8)
+prev_x, prev_y = 0, 0
+
+running = True
+while running:
+    for x, y, color_idx in squares:
+        frame[prev_y : prev_y + 100, prev_x : prev_x + 100] = 0
+        frame[y : y + 100, x : x + 100] = patches[color_idx]
+        prev_x, prev_y = x, y
+
         cv2.imshow("frame", frame)
-        time.sleep(0.01)  # Increased delay to make animation more visible
 
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            exit()
+        # waitKey both paces the animation and pumps the GUI event loop
+        if cv2.waitKey(10) & 0xFF == ord("q"):
+            running = False
+            break
+
+cv2.destroyAllWindows()
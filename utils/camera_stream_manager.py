@@ -1,36 +1,260 @@
 """
 Camera Stream Manager for handling multiple clients with single camera connections.
-Uses PyFFMPEG and OpenCV for optimal performance.
+Uses an FFmpeg subprocess (hardware decode + MJPEG output) with an OpenCV fallback.
 """
 
 import asyncio
+import functools
+import os
+import re
+import struct
+import subprocess
+import sys
 import threading
 import time
-from collections import deque
-from typing import Dict, List, Optional
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
 
 import cv2
 
-from utils.config import CAMERA_CONFIG, FFMPEG_CONFIG, OPENCV_CONFIG
+from constants.paths import BASE_DIR
+from utils.config import CAMERA_CONFIG, FFMPEG_CONFIG, OPENCV_CONFIG, PERFORMANCE_CONFIG
+
+# Every camera already has its own thread (or process); stop OpenCV/OpenMP from
+# spawning a thread pool per camera on top of that. cv2 and numpy are already
+# imported at this point, so OMP_NUM_THREADS only takes effect in the spawned
+# capture processes, which inherit it before importing them.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+cv2.setNumThreads(1)
+
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+
+    _TJ = TurboJPEG()
+except Exception as e:
+    # PyTurboJPEG or the native libturbojpeg library is missing
+    print(f"TurboJPEG unavailable, falling back to OpenCV JPEG encoding: {e}")
+    _TJ = None
+
+_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, CAMERA_CONFIG["jpeg_quality"]]
+
+# ffmpeg pixel format matching each TurboJPEG subsampling, so both encoders emit the same chroma layout
+_FFMPEG_PIX_FMTS = {0: "yuvj444p", 1: "yuvj422p", 2: "yuvj420p"}
+
+# JPEG start/end of image markers, used to split ffmpeg's MJPEG pipe into frames
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_EOI = b"\xff\xd9"
+
+# Length prefix of every JPEG on the capture process pipe (0 = frame unchanged)
+_FRAME_HEADER = struct.Struct("<I")
+
+
+def encode_jpeg(frame) -> Optional[bytes]:
+    """Encode a BGR frame to JPEG, using libjpeg-turbo's SIMD encoder when available."""
+    if _TJ is not None:
+        return _TJ.encode(
+            frame,
+            quality=CAMERA_CONFIG["jpeg_quality"],
+            pixel_format=TJPF_BGR,
+            jpeg_subsample=CAMERA_CONFIG["jpeg_subsample"],
+        )
+
+    ok, buf = cv2.imencode(".jpg", frame, _JPEG_PARAMS)
+    return buf.tobytes() if ok else None
+
+
+def _ffmpeg_qscale(quality: int) -> int:
+    """ffmpeg MJPEG -q:v (2 = best, 31 = worst) giving about the same PSNR as a libjpeg quality (q85 -> 4, q75 -> 6)."""
+    return max(2, min(31, round((100 - quality) / 5) + 1))
+
+
+def downscale(frame):
+    """Shrink a frame to the configured stream width, keeping its aspect ratio."""
+    width = CAMERA_CONFIG["stream_width"]
+    height, frame_width = frame.shape[:2]
+    if not width or frame_width <= width:
+        return frame
+    return cv2.resize(frame, (width, round(height * width / frame_width)), interpolation=cv2.INTER_AREA)
+
+
+def _pin_to_cpu(camera_name: str, cpu_slot: Optional[int]):
+    """Pin the calling thread (and the processes it spawns) to the CPU at cpu_slot, wrapping around."""
+    if cpu_slot is None or not PERFORMANCE_CONFIG["pin_camera_cpus"] or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[cpu_slot % len(cpus)]})
+    except OSError as e:
+        print(f"Could not pin {camera_name} to a CPU: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_version() -> tuple[int, int]:
+    """Major/minor version of the ffmpeg binary, used to pick options that changed between releases."""
+    output = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, check=True).stdout
+    match = re.search(r"ffmpeg version n?(\d+)\.(\d+)", output)
+    # Git snapshots ("ffmpeg version N-...") are newer than any release
+    return (int(match[1]), int(match[2])) if match else (999, 0)
+
+
+def _create_ffmpeg_capture(rtsp_url: str):
+    """Create OpenCV capture using FFmpeg backend for better RTSP performance."""
+    # Add RTSP optimization parameters to URL
+    url = rtsp_url
+    sep = "&" if "?" in url else "?"
+    url += f"{sep}rtsp_transport=tcp&fflags=nobuffer&flags=low_delay&stimeout={FFMPEG_CONFIG['stimeout']}"
+
+    cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, OPENCV_CONFIG["ip_camera"]["buffer_size"])
+    cap.set(cv2.CAP_PROP_FPS, OPENCV_CONFIG["ip_camera"]["fps"])
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, OPENCV_CONFIG["ip_camera"]["width"])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, OPENCV_CONFIG["ip_camera"]["height"])
+    return cap
+
+
+def _open_capture(camera_name: str, rtsp_url: str):
+    """Open an OpenCV capture for a webcam ("0") or an IP camera, or return None."""
+    if rtsp_url == "0":
+        # Webcam
+        cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.set(cv2.CAP_PROP_FPS, CAMERA_CONFIG["target_fps"])
+    else:
+        # IP Camera - try PyFFMPEG first, fallback to OpenCV
+        try:
+            cap = _create_ffmpeg_capture(rtsp_url)
+        except Exception as e:
+            print(f"PyFFMPEG failed for {camera_name}, falling back to OpenCV: {e}")
+            cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    if not cap.isOpened():
+        print(f"Failed to open camera: {camera_name}")
+        cap.release()
+        return None
+
+    print(f"Successfully connected to camera: {camera_name}")
+    return cap
+
+
+def _read_latest(cap):
+    """Read the newest frame, discarding frames already queued in the capture buffer.
+
+    A grab that returns almost immediately was served from the buffer rather than
+    the camera, so keep grabbing until one blocks (we are at the live edge).
+    """
+    for _ in range(CAMERA_CONFIG["max_stale_grabs"]):
+        start = time.monotonic()
+        if not cap.grab():
+            return False, None
+        if time.monotonic() - start >= CAMERA_CONFIG["stale_grab_threshold"]:
+            break
+    return cap.retrieve()
+
+
+def _frame_signature(frame) -> int:
+    """Cheap signature of a frame from a strided sample (every 16th pixel, one channel) to detect repeats."""
+    return hash(frame[::16, ::16, 0].tobytes())
+
+
+def capture_frames(camera_name: str, rtsp_url: str, should_run: Callable[[], bool]) -> Iterator[Optional[bytes]]:
+    """Decode a camera with OpenCV and yield a JPEG for every frame it produces.
+
+    Yields None when the frame matches the previous one, so the cached JPEG can be reused.
+    """
+    cap = _open_capture(camera_name, rtsp_url)
+    if cap is None:
+        return
+
+    # Slightly under the target interval, so jitter does not drop frames of a source already at target_fps
+    min_interval = 0.9 / CAMERA_CONFIG["target_fps"]
+    max_reuse_age = PERFORMANCE_CONFIG["jpeg_cache_max_age"]
+    last_read = 0.0
+    last_signature = None
+    last_encode = 0.0
+    try:
+        # Grabbing blocks at the source frame rate, so the decoder clock paces this loop
+        while should_run():
+            if time.monotonic() - last_read < min_interval:
+                # Too early for the next frame: advance without retrieving it (no BGR conversion)
+                if not cap.grab():
+                    time.sleep(0.1)
+                    continue
+                if time.monotonic() - last_read < min_interval:
+                    continue
+                # The grab blocked past the interval, so it holds the live frame: use it
+                ret, frame = cap.retrieve()
+            else:
+                # Fell behind (or first frame): skip whatever queued up meanwhile
+                ret, frame = _read_latest(cap)
+            if not ret:
+                time.sleep(0.1)
+                continue
+            last_read = time.monotonic()
+
+            frame = downscale(frame)
+            signature = _frame_signature(frame) if PERFORMANCE_CONFIG["jpeg_cache_enabled"] else None
+            # The signature only samples the frame, so re-encode periodically to pick up changes it missed
+            if signature is not None and signature == last_signature and last_read - last_encode < max_reuse_age:
+                # Scene unchanged: keep serving the cached JPEG, skip the encode
+                frame_bytes = None
+            else:
+                frame_bytes = encode_jpeg(frame)
+                if frame_bytes is None:
+                    continue
+                last_signature = signature
+                last_encode = last_read
+
+            yield frame_bytes
+    finally:
+        cap.release()
+
+
+def capture_process_main(camera_name: str, rtsp_url: str, cpu_slot: Optional[int], out: BinaryIO):
+    """Body of a per-camera capture process: write each JPEG to out, length-prefixed (length 0 if unchanged)."""
+    _pin_to_cpu(camera_name, cpu_slot)
+    try:
+        # Runs until the parent kills the process or stops reading
+        for frame_bytes in capture_frames(camera_name, rtsp_url, lambda: True):
+            frame_bytes = frame_bytes or b""
+            out.write(_FRAME_HEADER.pack(len(frame_bytes)))
+            out.write(frame_bytes)
+            out.flush()
+    except BrokenPipeError:
+        # Parent went away
+        pass
+    except Exception as e:
+        print(f"Error in capture process for {camera_name}: {e}")
 
 
 class CameraStream:
     """Manages a single camera stream with multiple clients."""
 
-    def __init__(self, camera_name: str, rtsp_url: str, max_buffer_size: int = None):
+    # Multipart/x-mixed-replace part header and trailer written around every JPEG
+    # (Content-Length is optional in MJPEG parts, so the header never changes)
+    HEAD = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+    TAIL = b"\r\n"
+
+    def __init__(
+        self,
+        camera_name: str,
+        rtsp_url: str,
+        on_clients_changed: Optional[Callable[[int], None]] = None,
+        cpu_slot: Optional[int] = None,
+    ):
         self.camera_name = camera_name
         self.rtsp_url = rtsp_url
-        self.max_buffer_size = max_buffer_size or CAMERA_CONFIG["max_buffer_size"]
-        self.frame_buffer = deque(maxlen=self.max_buffer_size)
-        self.clients: List[asyncio.Queue] = []
+        self.cpu_slot = cpu_slot  # CPU the OpenCV capture is pinned to (None = not pinned)
+        self.clients = 0  # Number of connected clients
+        self._on_clients_changed = on_clients_changed  # Called with +1/-1 when a client joins/leaves
         self.is_running = False
-        self.last_frame = None
         self.last_frame_time = 0
-        self.last_frame_jpeg = None  # Cache JPEG to avoid re-encoding
-        self.frame_interval = 1.0 / CAMERA_CONFIG["target_fps"]
+        self.last_frame_chunk = None  # Latest JPEG as a multipart part, shared by every client
+        self.frame_id = 0  # Incremented each time a new JPEG is published
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._new_frame = asyncio.Event()
         self.lock = threading.Lock()
         self.stream_thread = None
-        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, CAMERA_CONFIG["jpeg_quality"]]
+        self._child_proc: Optional[subprocess.Popen] = None  # ffmpeg or capture process the worker reads from
 
     def start(self):
         """Start the camera stream thread."""
@@ -43,132 +267,219 @@ class CameraStream:
     def stop(self):
         """Stop the camera stream thread."""
         self.is_running = False
+        # Read once: the worker clears _child_proc when the child exits
+        proc = self._child_proc
+        if proc is not None:
+            # Unblock the worker waiting on the child's pipe
+            proc.terminate()
         if self.stream_thread:
             self.stream_thread.join(timeout=1.0)
         print(f"Stopped stream for camera: {self.camera_name}")
 
     def _stream_worker(self):
         """Worker thread that continuously reads from camera."""
-        cap = None
-        try:
-            if self.rtsp_url == "0":
-                # Webcam
-                cap = cv2.VideoCapture(0)
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            else:
-                # IP Camera - try PyFFMPEG first, fallback to OpenCV
-                try:
-                    cap = self._create_ffmpeg_capture()
-                except Exception as e:
-                    print(f"PyFFMPEG failed for {self.camera_name}, falling back to OpenCV: {e}")
-                    cap = cv2.VideoCapture(self.rtsp_url)
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-
-            if not cap.isOpened():
-                print(f"Failed to open camera: {self.camera_name}")
+        if self.rtsp_url != "0" and FFMPEG_CONFIG["transcode"]:
+            # IP Camera - let ffmpeg decode and encode, fallback to OpenCV
+            self._transcode_loop()
+            if not self.is_running:
                 return
 
-            print(f"Successfully connected to camera: {self.camera_name}")
+        if PERFORMANCE_CONFIG["process_per_camera"]:
+            self._capture_process_worker()
+        else:
+            self._capture_worker()
 
-            while self.is_running:
-                ret, frame = cap.read()
-                if ret:
-                    current_time = time.time()
-
-                    # Only update if enough time has passed (rate limiting)
-                    if current_time - self.last_frame_time >= self.frame_interval:
-                        # Encode ONCE outside the lock
-                        ok, buf = cv2.imencode(".jpg", frame, self.jpeg_params)
-                        if not ok:
-                            time.sleep(0.001)
-                            continue
-                        frame_bytes = buf.tobytes()
-
-                        with self.lock:
-                            # Store frame and JPEG data
-                            self.last_frame = frame  # No .copy() needed
-                            self.last_frame_time = current_time
-                            self.last_frame_jpeg = frame_bytes
-
-                            # Add to buffer if needed
-                            if len(self.frame_buffer) < self.max_buffer_size:
-                                self.frame_buffer.append(frame)  # No .copy() needed
-
-                        # Notify all clients with the same JPEG bytes
-                        self._notify_clients(frame_bytes)
-
-                        # Pace using remaining time instead of fixed sleep
-                        remaining = self.frame_interval - (time.time() - current_time)
-                        if remaining > 0:
-                            time.sleep(remaining)
-                    else:
-                        time.sleep(0.001)
-                else:
-                    time.sleep(0.1)
+    def _transcode_loop(self):
+        """Keep an ffmpeg transcoder running; return only on stop or when OpenCV should take over.
+
+        Once ffmpeg has produced frames, an exit (camera reboot, network stall) restarts it with a
+        growing delay instead of falling back, so the camera recovers on its own.
+        """
+        delay = FFMPEG_CONFIG["restart_delay"]
+        ever_published = False
+        while self.is_running:
+            try:
+                published = self._transcode_worker()
+            except Exception as e:
+                print(f"FFmpeg failed for {self.camera_name}, falling back to OpenCV: {e}")
+                return
+            if not self.is_running:
+                return
+
+            if published:
+                ever_published = True
+                delay = FFMPEG_CONFIG["restart_delay"]
+            elif not ever_published:
+                print(f"FFmpeg produced no frames for {self.camera_name}, falling back to OpenCV")
+                return
 
+            print(f"Restarting FFmpeg for {self.camera_name} in {delay:g}s")
+            self._sleep_while_running(delay)
+            if not published:
+                delay = min(delay * 2, FFMPEG_CONFIG["restart_max_delay"])
+
+    def _sleep_while_running(self, seconds: float):
+        """Sleep for up to the given time, waking early when the stream is stopped."""
+        deadline = time.monotonic() + seconds
+        while self.is_running and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def _transcode_worker(self) -> bool:
+        """Read JPEGs from an ffmpeg process decoding the RTSP stream; return True if any frame arrived."""
+        self._child_proc = proc = subprocess.Popen(
+            self._ffmpeg_command(), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, bufsize=0
+        )
+        print(f"Started FFmpeg transcoder for camera: {self.camera_name}")
+
+        published = False
+        buffer = bytearray()
+        try:
+            while self.is_running:
+                chunk = proc.stdout.read(FFMPEG_CONFIG["read_size"])
+                if not chunk:
+                    print(f"FFmpeg exited for camera: {self.camera_name}")
+                    break
+                buffer += chunk
+
+                # Slice every complete SOI..EOI JPEG out of the pipe buffer
+                while (start := buffer.find(_JPEG_SOI)) >= 0 and (end := buffer.find(_JPEG_EOI, start + 2)) >= 0:
+                    self._publish_frame(bytes(buffer[start : end + 2]), time.time())
+                    del buffer[: end + 2]
+                    published = True
+        finally:
+            proc.kill()
+            proc.wait()
+            self._child_proc = None
+        return published
+
+    def _ffmpeg_command(self) -> list[str]:
+        """Build the ffmpeg command line that turns the RTSP stream into MJPEG on stdout."""
+        version = _ffmpeg_version()
+        # -nostdin: never read keystrokes from (or change the mode of) the server's terminal;
+        # errors are written to the server's stderr
+        cmd = ["ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error"]
+        if FFMPEG_CONFIG["hwaccel"]:
+            cmd += ["-hwaccel", FFMPEG_CONFIG["hwaccel"]]
+        cmd += [
+            "-rtsp_transport", FFMPEG_CONFIG["rtsp_transport"],
+            # Socket timeout in microseconds; FFmpeg 4.x calls it -stimeout (its -timeout enables listen mode)
+            "-timeout" if version >= (5, 0) else "-stimeout", str(FFMPEG_CONFIG["stimeout"]),
+            "-fflags", FFMPEG_CONFIG["fflags"],
+            "-flags", FFMPEG_CONFIG["flags"],
+            "-threads", str(FFMPEG_CONFIG["threads"]),
+            "-i", self.rtsp_url,
+            "-an",
+        ]  # fmt: skip
+        if CAMERA_CONFIG["stream_width"]:
+            # Downscale inside ffmpeg, keeping the aspect ratio (even height for the encoder)
+            cmd += ["-vf", f"scale='min({CAMERA_CONFIG['stream_width']},iw)':-2"]
+        cmd += [
+            "-f", "image2pipe",
+            "-c:v", "mjpeg",
+            "-pix_fmt", _FFMPEG_PIX_FMTS[CAMERA_CONFIG["jpeg_subsample"]],
+            "-q:v", str(_ffmpeg_qscale(CAMERA_CONFIG["jpeg_quality"])),
+            # Cap the rate by dropping frames only; image2pipe defaults to CFR, which would duplicate frames of slower cameras
+            "-r", str(CAMERA_CONFIG["target_fps"]),
+            "-fps_mode" if version >= (5, 1) else "-vsync", "vfr",
+            "-",
+        ]  # fmt: skip
+        return cmd
+
+    def _capture_worker(self):
+        """Decode with OpenCV and encode each frame to JPEG on this thread."""
+        _pin_to_cpu(self.camera_name, self.cpu_slot)
+        try:
+            for frame_bytes in capture_frames(self.camera_name, self.rtsp_url, lambda: self.is_running):
+                self._publish_frame(frame_bytes, time.time())
         except Exception as e:
             print(f"Error in stream worker for {self.camera_name}: {e}")
+
+    def _capture_process_worker(self):
+        """Run the OpenCV capture in a child process and publish the JPEGs it sends back."""
+        # A fresh interpreter that only imports the capture code; multiprocessing's spawn would
+        # re-run main.py (camera sheet, FastAPI app, signal handlers) in every child
+        cmd = [sys.executable, "-m", "utils.capture_process", self.camera_name]
+        if self.cpu_slot is not None:
+            cmd.append(str(self.cpu_slot))
+        self._child_proc = proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=BASE_DIR)
+        # The URL carries the camera credentials, so it goes over stdin rather than the (world-readable) argv
+        proc.stdin.write(self.rtsp_url.encode() + b"\n")
+        proc.stdin.close()
+
+        try:
+            while self.is_running:
+                header = proc.stdout.read(_FRAME_HEADER.size)
+                if len(header) < _FRAME_HEADER.size:
+                    print(f"Capture process exited for camera: {self.camera_name}")
+                    break
+                (size,) = _FRAME_HEADER.unpack(header)
+                frame_bytes = proc.stdout.read(size)
+                if len(frame_bytes) == size:
+                    # An empty frame means the frame did not change
+                    self._publish_frame(frame_bytes or None, time.time())
         finally:
-            if cap:
-                cap.release()
-
-    def _create_ffmpeg_capture(self):
-        """Create OpenCV capture using FFmpeg backend for better RTSP performance."""
-        # Add RTSP optimization parameters to URL
-        url = self.rtsp_url
-        sep = "&" if "?" in url else "?"
-        url += f"{sep}rtsp_transport=tcp&fflags=nobuffer&flags=low_delay&stimeout={FFMPEG_CONFIG['stimeout']}"
-
-        cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, OPENCV_CONFIG["ip_camera"]["buffer_size"])
-        cap.set(cv2.CAP_PROP_FPS, OPENCV_CONFIG["ip_camera"]["fps"])
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, OPENCV_CONFIG["ip_camera"]["width"])
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, OPENCV_CONFIG["ip_camera"]["height"])
-        return cap
-
-    def _notify_clients(self, frame_bytes: bytes):
-        """Notify all connected clients with the new frame."""
-        if not self.clients:
+            proc.kill()
+            proc.wait()
+            self._child_proc = None
+
+    def _publish_frame(self, frame_bytes: Optional[bytes], frame_time: float):
+        """Store a new JPEG as the latest frame and wake the clients.
+
+        frame_bytes is None when the frame repeated the previous one; only the time is refreshed.
+        The multipart part is built here once, so every client sends the same bytes object.
+        Only the stream thread writes these attributes and single assignments are atomic, so no
+        lock is taken: the chunk is stored before frame_id moves, so readers never see a new id
+        with an old frame.
+        """
+        self.last_frame_time = frame_time
+        if frame_bytes is None:
             return
+        self.last_frame_chunk = b"".join((self.HEAD, frame_bytes, self.TAIL))
+        self.frame_id += 1
 
-        # Keep all clients, even slow ones (they just lose this frame)
-        alive = []
-        for client_queue in self.clients:
-            try:
-                if not client_queue.full():
-                    client_queue.put_nowait(frame_bytes)
-                # Even if queue is full, keep the client (they just lose this frame)
-                alive.append(client_queue)
-            except Exception:
-                # Real error: remove client
-                pass
-
-        self.clients = alive
-
-    def add_client(self, client_queue: asyncio.Queue):
-        """Add a new client to receive frames."""
+        # Wake all clients, they send the same chunk
+        self._notify_clients()
+
+    def _notify_clients(self):
+        """Wake the clients waiting for a frame (called from the stream thread)."""
+        if not self.clients or self._loop is None:
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(self._wake_clients)
+        except RuntimeError:
+            # Event loop already closed (shutting down)
+            pass
+
+    def _wake_clients(self):
+        """Release every waiting client; clients busy sending catch up through frame_id."""
+        self._new_frame.set()
+        self._new_frame.clear()
+
+    async def wait_for_frame(self, last_seen_id: int) -> int:
+        """Wait until a frame newer than last_seen_id is published and return its id."""
+        while self.frame_id == last_seen_id:
+            await self._new_frame.wait()
+        return self.frame_id
+
+    def add_client(self):
+        """Register a new client. Must be called from the event loop serving it."""
+        self._loop = asyncio.get_running_loop()
         with self.lock:
-            self.clients.append(client_queue)
-            # Send the last frame immediately if available (using cached JPEG)
-            if self.last_frame_jpeg is not None:
-                try:
-                    client_queue.put_nowait(self.last_frame_jpeg)
-                except asyncio.QueueFull:
-                    pass
-
-    def remove_client(self, client_queue: asyncio.Queue):
-        """Remove a client from the stream."""
+            self.clients += 1
+        if self._on_clients_changed is not None:
+            self._on_clients_changed(1)
+
+    def remove_client(self):
+        """Unregister a client from the stream."""
         with self.lock:
-            if client_queue in self.clients:
-                self.clients.remove(client_queue)
+            self.clients -= 1
+        if self._on_clients_changed is not None:
+            self._on_clients_changed(-1)
 
     def get_frame_count(self) -> int:
         """Get the number of active clients."""
-        return len(self.clients)
-
-    def get_buffer_size(self) -> int:
-        """Get the current buffer size."""
-        return len(self.frame_buffer)
+        return self.clients
 
 
 class CameraStreamManager:
@@ -177,17 +488,26 @@ class CameraStreamManager:
     def __init__(self):
         self.cameras: Dict[str, CameraStream] = {}
         self.lock = threading.Lock()
+        self.total_clients = 0  # Clients across all cameras, kept up to date by the streams
+        self._next_cpu_slot = 0  # Cameras are spread over the CPUs round-robin
+        self._clients_lock = threading.Lock()
 
     def add_camera(self, camera_name: str, rtsp_url: str) -> CameraStream:
         """Add a new camera to the manager."""
         with self.lock:
             if camera_name not in self.cameras:
-                camera_stream = CameraStream(camera_name, rtsp_url)
+                camera_stream = CameraStream(camera_name, rtsp_url, self._update_total_clients, cpu_slot=self._next_cpu_slot)
+                self._next_cpu_slot += 1
                 self.cameras[camera_name] = camera_stream
                 camera_stream.start()
                 print(f"Added camera: {camera_name}")
             return self.cameras[camera_name]
 
+    def _update_total_clients(self, delta: int):
+        """Apply a client count change reported by one of the streams."""
+        with self._clients_lock:
+            self.total_clients += delta
+
     def get_camera(self, camera_name: str) -> Optional[CameraStream]:
         """Get a camera stream by name."""
         return self.cameras.get(camera_name)
@@ -201,17 +521,21 @@ class CameraStreamManager:
                 print(f"Removed camera: {camera_name}")
 
     def get_camera_status(self) -> Dict[str, Dict]:
-        """Get status of all cameras."""
-        status = {}
-        with self.lock:
-            for name, camera in self.cameras.items():
-                status[name] = {
-                    "clients": camera.get_frame_count(),
-                    "buffer_size": camera.get_buffer_size(),
-                    "is_running": camera.is_running,
-                    "last_frame_time": camera.last_frame_time,
-                }
-        return status
+        """Get status of all cameras.
+
+        Reads each stream's fields without locking (attribute reads are atomic), so a status
+        request never waits on a stream thread or on stop_all joining them.
+        """
+        return {
+            name: {
+                "clients": camera.clients,
+                "buffer_size": 0,  # Frames are no longer buffered; kept for status consumers
+                "is_running": camera.is_running,
+                "last_frame_time": camera.last_frame_time,
+            }
+            # Snapshot the items, cameras may be added or removed concurrently
+            for name, camera in list(self.cameras.items())
+        }
 
     def stop_all(self):
         """Stop all camera streams."""
@@ -0,0 +1,36 @@
+"""
+Entry point of the per-camera OpenCV capture process.
+
+Started by CameraStream as ``python -m utils.capture_process <camera_name> [cpu_slot]``,
+so the child imports only the capture code and not main.py. The RTSP URL is read from the
+first line of stdin, keeping the camera credentials out of the process list. JPEGs are
+written to stdout, length-prefixed; everything else the process prints goes to stderr.
+"""
+
+import os
+import signal
+import sys
+
+
+def main():
+    """Keep stdout for the frames only, then run the capture loop."""
+    # Ctrl+C reaches the whole process group; the parent stops us with terminate() instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Frames go to a duplicate of the original stdout; fd 1 itself (our prints and native
+    # library logs) is pointed at stderr so nothing else can end up in the frame stream
+    frames = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout.reconfigure(line_buffering=True)
+
+    # Imported after the redirect, importing it can already print (TurboJPEG fallback warning)
+    from utils.camera_stream_manager import capture_process_main
+
+    camera_name = sys.argv[1]
+    cpu_slot = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    rtsp_url = sys.stdin.readline().rstrip("\n")
+    capture_process_main(camera_name, rtsp_url, cpu_slot, frames)
+
+
+if __name__ == "__main__":
+    main()
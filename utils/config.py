@@ -4,12 +4,14 @@ Configuration settings for camera stream optimization.
 
 # Camera stream settings
 CAMERA_CONFIG = {
-    "max_buffer_size": 30,  # Maximum frames to buffer
     "target_fps": 30,  # Target frames per second
-    "jpeg_quality": 85,  # JPEG compression quality (0-100)
+    "jpeg_quality": 75,  # JPEG compression quality (0-100), also mapped to the ffmpeg transcoder's -q:v
+    "jpeg_subsample": 2,  # TurboJPEG chroma subsampling (0 = 4:4:4, 1 = 4:2:2, 2 = 4:2:0)
+    "stream_width": 1280,  # Frames wider than this are downscaled before encoding (0 to disable)
     "frame_timeout": 30.0,  # Timeout for frame delivery (seconds)
-    "client_queue_size": 10,  # Maximum frames in client queue
     "keepalive_interval": 5.0,  # Keep-alive frame interval (seconds)
+    "stale_grab_threshold": 0.005,  # Grabs faster than this came from the buffer (seconds)
+    "max_stale_grabs": 10,  # Maximum buffered frames discarded per read
 }
 
 # OpenCV settings for different camera types
@@ -37,15 +39,22 @@ FFMPEG_CONFIG = {
     "flags": "low_delay",  # Low delay flag
     "probesize": 32,  # Minimal probe size for faster startup
     "analyzeduration": 0,  # No analysis delay
+    "transcode": True,  # Decode + JPEG-encode IP cameras in an ffmpeg process instead of OpenCV
+    "hwaccel": "auto",  # Hardware decoder for ffmpeg (auto, cuda, vaapi, qsv; empty to disable)
+    "read_size": 65536,  # Bytes read from the ffmpeg pipe per call
+    "threads": 1,  # ffmpeg decoder threads per camera (0 = one per core)
+    "restart_delay": 1.0,  # Delay before restarting an ffmpeg transcoder that exited (seconds)
+    "restart_max_delay": 30.0,  # Upper bound of the restart delay, doubled after each failed restart
 }
 
 # Performance tuning
 PERFORMANCE_CONFIG = {
     "max_concurrent_streams": 10,  # Maximum concurrent camera streams
     "max_clients_per_camera": 50,  # Maximum clients per camera
-    "frame_skip_threshold": 0.1,  # Skip frame if client is too slow (seconds)
-    "cleanup_interval": 60.0,  # Cleanup interval for disconnected clients (seconds)
     "jpeg_cache_enabled": True,  # Enable JPEG caching to avoid re-encoding
-    "frame_copy_optimization": True,  # Optimize frame copying
+    "jpeg_cache_max_age": 1.0,  # Re-encode an apparently unchanged frame after this long (seconds)
     "rtsp_low_latency": True,  # Enable RTSP low-latency optimizations
+    "process_per_camera": True,  # Run OpenCV capture + encode in a child process per camera (bypasses the GIL)
+    "pin_camera_cpus": True,  # Pin each camera's worker to one CPU core (Linux only)
+    "event_loop": "uvloop",  # uvicorn event loop (uvloop, asyncio or auto); Windows always uses asyncio
 }
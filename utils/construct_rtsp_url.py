@@ -2,6 +2,33 @@
 Utility functions for constructing RTSP URLs for different camera brands.
 """
 
+from typing import Callable
+
+
+def _hikvision_url(username: str, password: str, ip: str, port: int, channel: int, stream_type: str) -> str:
+    # HIKVISION and EZVIZ use the same URL format
+    return f"rtsp://{username}:{password}@{ip}:{port}/Streaming/Channels/10{channel}"
+
+
+def _intelbras_url(username: str, password: str, ip: str, port: int, channel: int, stream_type: str) -> str:
+    # Intelbras standard format from rtsp.txt
+    subtype = 0 if stream_type == "main" else 1
+    return f"rtsp://{username}:{password}@{ip}:{port}/cam/realmonitor?channel={channel}&subtype={subtype}"
+
+
+def _webcam_url(username: str, password: str, ip: str, port: int, channel: int, stream_type: str) -> str:
+    # For webcams, return 0 to use with OpenCV
+    return "0"
+
+
+# URL builder for each supported brand (upper case)
+_BUILDERS: dict[str, Callable[[str, str, str, int, int, str], str]] = {
+    "HIKVISION": _hikvision_url,
+    "EZVIZ": _hikvision_url,
+    "INTELBRAS": _intelbras_url,
+    "WEBCAM": _webcam_url,
+}
+
 
 def construct_rtsp_url(
     brand: str, username: str, password: str, ip: str, port: int = 554, channel: int = 1, stream_type: str = "main"
@@ -24,23 +51,11 @@ def construct_rtsp_url(
     Raises:
         ValueError: If brand is not supported
     """
-    brand_upper = brand.upper()
-
-    if brand_upper in ["HIKVISION", "EZVIZ"]:
-        # HIKVISION and EZVIZ use the same URL format
-        return f"rtsp://{username}:{password}@{ip}:{port}/Streaming/Channels/10{channel}"
-
-    elif brand_upper == "INTELBRAS":
-        # Intelbras standard format from rtsp.txt
-        subtype = 0 if stream_type == "main" else 1
-        return f"rtsp://{username}:{password}@{ip}:{port}/cam/realmonitor?channel={channel}&subtype={subtype}"
-
-    elif brand_upper == "WEBCAM":
-        # For webcams, return 0 to use with OpenCV
-        return "0"
+    builder = _BUILDERS.get(brand.upper())
+    if builder is None:
+        raise ValueError(f"Unsupported camera brand: {brand}. Supported brands: {', '.join(_BUILDERS)}")
 
-    else:
-        raise ValueError(f"Unsupported camera brand: {brand}. Supported brands: HIKVISION, EZVIZ, INTELBRAS, WEBCAM")
+    return builder(username, password, ip, port, channel, stream_type)
 
 
 def get_supported_brands() -> list[str]:
@@ -50,7 +65,7 @@ def get_supported_brands() -> list[str]:
     Returns:
         List of supported brand names
     """
-    return ["HIKVISION", "EZVIZ", "INTELBRAS", "WEBCAM"]
+    return list(_BUILDERS)
 
 
 def is_webcam(brand: str) -> bool:
@@ -2,24 +2,26 @@
 Status endpoint utilities for monitoring camera streams.
 """
 
+import asyncio
+
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from utils.camera_stream_manager import stream_manager
 
 
 def create_status_router() -> APIRouter:
     """Create a router for status endpoints."""
-    router = APIRouter(prefix="/api", tags=["status"])
+    router = APIRouter(prefix="/api", tags=["status"], default_response_class=ORJSONResponse)
 
     @router.get("/status")
     async def get_status():
         """Get overall system status."""
         camera_status = stream_manager.get_camera_status()
         total_cameras = len(camera_status)
-        total_clients = sum(status["clients"] for status in camera_status.values())
+        total_clients = stream_manager.total_clients
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "system": "Camera Stream Manager",
                 "status": "running",
@@ -34,15 +36,15 @@ def create_status_router() -> APIRouter:
         """Get status for a specific camera."""
         camera = stream_manager.get_camera(camera_name)
         if not camera:
-            return JSONResponse({"error": f"Camera {camera_name} not found"}, status_code=404)
+            return ORJSONResponse({"error": f"Camera {camera_name} not found"}, status_code=404)
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "camera_name": camera_name,
                 "rtsp_url": camera.rtsp_url,
                 "is_running": camera.is_running,
                 "clients": camera.get_frame_count(),
-                "buffer_size": camera.get_buffer_size(),
+                "buffer_size": 0,  # Frames are no longer buffered; kept for status consumers
                 "last_frame_time": camera.last_frame_time,
             }
         )
@@ -52,12 +54,12 @@ def create_status_router() -> APIRouter:
         """Restart a camera stream."""
         camera = stream_manager.get_camera(camera_name)
         if not camera:
-            return JSONResponse({"error": f"Camera {camera_name} not found"}, status_code=404)
+            return ORJSONResponse({"error": f"Camera {camera_name} not found"}, status_code=404)
 
-        # Restart the camera
-        camera.stop()
+        # Restart the camera off the event loop (stop() joins the stream thread)
+        await asyncio.to_thread(camera.stop)
         camera.start()
 
-        return JSONResponse({"message": f"Camera {camera_name} restarted successfully", "status": "restarting"})
+        return ORJSONResponse({"message": f"Camera {camera_name} restarted successfully", "status": "restarting"})
 
     return router